@@ -1,69 +1,155 @@
 import os
+import uuid
+from dataclasses import asdict
 from pathlib import Path
+from typing import List
 
-from fastapi import APIRouter, BackgroundTasks, File, HTTPException, UploadFile
+import aiofiles
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
+from fastapi.responses import ORJSONResponse
+from streaming_form_data import StreamingFormDataParser
+from streaming_form_data.parser import ParseFailedException
+from streaming_form_data.targets import BaseTarget
 
 from backend.app.schemas.clips import ClipOut
 from backend.app.schemas.jobs import JobCreatedResponse, JobDetail, JobFromLinkRequest
-from backend.domain.models import JobStatus
-from backend.domain.services.job_service import create_job, get_job, run_job, run_job_from_link
+from backend.domain.models import Job, JobStatus
+from backend.domain.services.job_service import (
+    create_job,
+    fail_job,
+    get_job,
+    run_job,
+    run_job_from_link,
+)
 
 # Optional max upload size in MB (0 = no limit). Set MAX_UPLOAD_MB in env to cap size.
 MAX_UPLOAD_MB = int(os.environ.get("MAX_UPLOAD_MB", "0"))  # 0 means no limit
 MAX_UPLOAD_BYTES = MAX_UPLOAD_MB * 1024 * 1024 if MAX_UPLOAD_MB else 0
-CHUNK_SIZE = 1024 * 1024  # 1 MB per read, keeps memory use low for large files
 
 router = APIRouter(prefix="/api/jobs", tags=["jobs"])
 
 
-@router.post("", response_model=JobCreatedResponse, status_code=202)
+class _UploadTarget(BaseTarget):
+    """
+    Multipart target that hands file bytes back to the route instead of spooling them,
+    so the route can write them to the job's final path with aiofiles.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.pending: List[bytes] = []
+
+    def on_data_received(self, chunk: bytes) -> None:
+        self.pending.append(chunk)
+
+
+# The body is read from request.stream() rather than an UploadFile parameter, so describe
+# the multipart "file" field explicitly to keep the upload form in /docs.
+_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"],
+                }
+            }
+        },
+    }
+}
+
+
+@router.post(
+    "",
+    response_model=JobCreatedResponse,
+    status_code=202,
+    openapi_extra=_UPLOAD_OPENAPI,
+)
 async def create_processing_job(
+    request: Request,
     background_tasks: BackgroundTasks,
-    file: UploadFile = File(...),
 ):
     """
-    Create a new processing job from an uploaded video file.
-    Large files are streamed to disk (no hard limit by default). Set MAX_UPLOAD_MB in env to cap size.
+    Create a new processing job from an uploaded video file (multipart field "file").
+    The body is parsed as it arrives and written straight to the job's path, skipping
+    Starlette's spooled temp file (no hard limit by default). Set MAX_UPLOAD_MB in env to cap size.
     """
-    if not file.filename:
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
         raise HTTPException(status_code=400, detail="No file uploaded")
-
-    size = getattr(file, "size", None)
-    if MAX_UPLOAD_BYTES and size is not None and size > MAX_UPLOAD_BYTES:
+    # Reject declared-oversized bodies before creating a job or touching disk; the running
+    # byte count below still catches chunked / understated uploads.
+    content_length = request.headers.get("content-length", "")
+    if MAX_UPLOAD_BYTES and content_length.isdigit() and int(content_length) > MAX_UPLOAD_BYTES:
         raise HTTPException(
             status_code=413,
-            detail=f"File too large. Maximum size is {MAX_UPLOAD_MB} MB (set MAX_UPLOAD_MB to allow more).",
+            detail=f"File too large. Maximum size is {MAX_UPLOAD_MB} MB.",
         )
 
-    job = create_job()
-    suffix = Path(file.filename).suffix or ".mp4"
+    target = _UploadTarget()
     jobs_dir = Path("jobs")
-    jobs_dir.mkdir(parents=True, exist_ok=True)
-    video_path = jobs_dir / f"{job.id}{suffix}"
+    # Bytes go to a temp file first; the job is only created once the upload has fully
+    # arrived, so a rejected / broken / disconnected upload never leaves an orphan job.
+    tmp_path: Path | None = None
 
     try:
+        parser = StreamingFormDataParser(headers=request.headers)
+        parser.register("file", target)
+
         total = 0
-        with video_path.open("wb") as f:
-            while True:
-                chunk = await file.read(CHUNK_SIZE)
-                if not chunk:
-                    break
-                total += len(chunk)
+        f = None
+        try:
+            async for chunk in request.stream():
+                parser.data_received(chunk)
+                if not target.pending:
+                    continue
+
+                if f is None:
+                    # The part headers (and so the filename) arrive before any file bytes.
+                    if not target.multipart_filename:
+                        raise HTTPException(status_code=400, detail="No file uploaded")
+                    jobs_dir.mkdir(parents=True, exist_ok=True)
+                    tmp_path = jobs_dir / f"upload-{uuid.uuid4().hex}.tmp"
+                    f = await aiofiles.open(tmp_path, "wb")
+
+                data = b"".join(target.pending)
+                target.pending.clear()
+                total += len(data)
                 if MAX_UPLOAD_BYTES and total > MAX_UPLOAD_BYTES:
-                    video_path.unlink(missing_ok=True)
                     raise HTTPException(
                         status_code=413,
                         detail=f"File too large. Maximum size is {MAX_UPLOAD_MB} MB.",
                     )
-                f.write(chunk)
-
-        if total == 0:
-            video_path.unlink(missing_ok=True)
-            raise HTTPException(status_code=400, detail="Uploaded file is empty")
+                await f.write(data)
+        finally:
+            if f is not None:
+                await f.close()
+
+        if tmp_path is None:
+            if target.multipart_filename:
+                raise HTTPException(status_code=400, detail="Uploaded file is empty")
+            raise HTTPException(status_code=400, detail="No file uploaded")
+
+        job = create_job()
+        suffix = Path(target.multipart_filename).suffix or ".mp4"
+        video_path = jobs_dir / f"{job.id}{suffix}"
+        try:
+            os.replace(tmp_path, video_path)
+        except OSError as e:
+            fail_job(job, f"Failed to save file: {e!s}")
+            raise
     except HTTPException:
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
         raise
+    except ParseFailedException as e:
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
+        raise HTTPException(status_code=400, detail="Malformed multipart upload") from e
     except OSError as e:
-        video_path.unlink(missing_ok=True)
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
         if e.errno == 28:  # ENOSPC
             raise HTTPException(
                 status_code=507,
@@ -73,8 +159,12 @@ async def create_processing_job(
             status_code=500,
             detail=f"Failed to save file: {e!s}. Check disk space and permissions.",
         ) from e
-    except Exception as e:
-        video_path.unlink(missing_ok=True)
+    except BaseException as e:
+        # Includes client disconnects / cancellation: drop the partial upload.
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
+        if not isinstance(e, Exception):
+            raise
         raise HTTPException(
             status_code=500,
             detail=f"Upload failed: {e!s}. For large files, check server disk space and logs.",
@@ -125,34 +215,32 @@ async def create_job_from_link(
     )
 
 
-@router.get("/{job_id}", response_model=JobDetail)
+def _clips_payload(job: Job) -> List[dict]:
+    """JSON-ready clips for a job (cached on completion, built from the Clip dataclasses otherwise)."""
+    if job.clips_payload is not None:
+        return job.clips_payload
+    return [asdict(c) for c in job.clips]
+
+
+# Clips come from our own Clip dataclasses, so GET handlers skip response-model
+# validation and serialize plain dicts with orjson; `responses` keeps the OpenAPI schema.
+@router.get("/{job_id}", response_model=None, responses={200: {"model": JobDetail}})
 async def get_job_status(job_id: str):
     job = get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    clips = [
-        ClipOut(
-            start=c.start,
-            end=c.end,
-            score=c.score,
-            energy_score=c.energy_score,
-            speech_density_score=c.speech_density_score,
-            keyword_score=c.keyword_score,
-            reason=c.reason,
-        )
-        for c in job.clips
-    ]
-
-    return JobDetail(
-        id=job.id,
-        status=job.status,
-        clips=clips,
-        error_message=job.error_message,
+    return ORJSONResponse(
+        {
+            "id": job.id,
+            "status": job.status.value,
+            "clips": _clips_payload(job),
+            "error_message": job.error_message,
+        }
     )
 
 
-@router.get("/{job_id}/clips", response_model=list[ClipOut])
+@router.get("/{job_id}/clips", response_model=None, responses={200: {"model": List[ClipOut]}})
 async def get_job_clips(job_id: str):
     job = get_job(job_id)
     if not job:
@@ -164,15 +252,4 @@ async def get_job_clips(job_id: str):
             detail=f"Job not completed yet (status={job.status})",
         )
 
-    return [
-        ClipOut(
-            start=c.start,
-            end=c.end,
-            score=c.score,
-            energy_score=c.energy_score,
-            speech_density_score=c.speech_density_score,
-            keyword_score=c.keyword_score,
-            reason=c.reason,
-        )
-        for c in job.clips
-    ]
+    return ORJSONResponse(_clips_payload(job))
@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 
 @dataclass
@@ -26,4 +26,6 @@ class Job:
     status: JobStatus
     clips: List[Clip] = field(default_factory=list)
     error_message: Optional[str] = None
+    # JSON-ready form of clips, built once on completion so status polls can skip re-serializing.
+    clips_payload: Optional[List[Dict[str, Any]]] = field(default=None, repr=False)
 
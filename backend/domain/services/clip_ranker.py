@@ -1,16 +1,24 @@
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, List, Optional, Tuple
 
-import librosa
 import numpy as np
+import soundfile as sf
 
 from backend.domain.models import Clip
-from backend.infrastructure.ffmpeg_adapter import extract_audio
+from backend.infrastructure import disk_cache
+from backend.infrastructure.ffmpeg_adapter import (
+    MAX_WAV_CACHE_BYTES,
+    decode_to_array,
+    extract_audio_cached,
+)
 from backend.infrastructure.whisper_adapter import (
+    WHISPER_SAMPLE_RATE,
     TranscriptSegment,
     transcribe,
+    transcript_variant,
     extract_keywords,
-    get_text_in_time_range,
+    load_audio,
 )
 
 
@@ -19,16 +27,22 @@ def _frame_signal(
     sr: int,
     window_seconds: float = 1.0,
 ) -> np.ndarray:
-    """Split audio into non-overlapping windows of fixed duration."""
+    """
+    Split audio into non-overlapping windows of fixed duration.
+    Returns a C-contiguous float32 (windows, samples) view, so the reshape never copies.
+    """
     samples_per_window = int(window_seconds * sr)
-    total_windows = len(y) // samples_per_window
-    trimmed = y[: total_windows * samples_per_window]
+    y32 = np.ascontiguousarray(y, dtype=np.float32)
+    total_windows = len(y32) // samples_per_window
+    trimmed = y32[: total_windows * samples_per_window]
     return trimmed.reshape(total_windows, samples_per_window)
 
 
 def _compute_window_energy(frames: np.ndarray) -> np.ndarray:
     """Compute RMS energy per frame and normalize to [0, 1]."""
-    rms = np.sqrt(np.mean(frames ** 2, axis=1) + 1e-9)
+    # einsum fuses square + sum per row, avoiding a full-size frames**2 temporary.
+    sum_sq = np.einsum("ij,ij->i", frames, frames)
+    rms = np.sqrt(sum_sq / frames.shape[1] + 1e-9)
     if rms.max() > 0:
         rms /= rms.max()
     return rms
@@ -49,21 +63,17 @@ def _sliding_window_indices(
     clip_length_seconds: float,
     step_seconds: float,
     frame_duration_seconds: float,
-) -> List[tuple]:
-    """Generate (start_frame, end_frame) indices for candidate clips."""
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Generate (start_frames, end_frames) index arrays for candidate clips."""
     frames_per_clip = int(clip_length_seconds / frame_duration_seconds)
-    step_frames = int(step_seconds / frame_duration_seconds)
+    step_frames = max(int(step_seconds / frame_duration_seconds), 1)
 
-    indices = []
-    start = 0
-    while start + frames_per_clip <= num_frames:
-        indices.append((start, start + frames_per_clip))
-        start += max(step_frames, 1)
+    starts = np.arange(0, num_frames - frames_per_clip + 1, step_frames, dtype=np.int64)
+    if starts.size == 0 and num_frames > 0:
+        # Audio shorter than one clip: use the whole thing as the only candidate.
+        return np.array([0], dtype=np.int64), np.array([num_frames], dtype=np.int64)
 
-    if not indices and num_frames > 0:
-        indices.append((0, num_frames))
-
-    return indices
+    return starts, starts + frames_per_clip
 
 
 def _format_time(seconds: float) -> str:
@@ -130,32 +140,80 @@ def _build_reason(
     )
 
 
-def _keyword_score_for_clip(
-    start_sec: float,
-    end_sec: float,
-    segments: List[TranscriptSegment],
-    keywords: List[str],
-) -> float:
-    """
-    Score [start_sec, end_sec] by how many keywords appear in speech in that range.
-    Returns value in [0, 1] (normalized by max possible hits in this clip).
-    """
-    if not keywords:
-        return 0.0
-    text = get_text_in_time_range(segments, start_sec, end_sec)
-    text_lower = text.lower()
+def _words_in_text(text: str) -> frozenset:
+    """Lowercased alphanumeric words (length >= 2) appearing in text."""
     words = set()
-    for w in text_lower.split():
+    for w in text.lower().split():
         w = "".join(c for c in w if c.isalnum())
         if len(w) >= 2:
             words.add(w)
-    hits = sum(1 for kw in keywords if kw.lower() in words)
-    return min(1.0, hits / max(1, len(keywords) * 0.3))
+    return frozenset(words)
+
+
+def _keyword_scores(
+    starts_sec: np.ndarray,
+    ends_sec: np.ndarray,
+    segments: List[TranscriptSegment],
+    keywords: List[str],
+) -> np.ndarray:
+    """
+    Score every window [start, end] by how many keywords appear in speech in that range.
+    Returns one value in [0, 1] per window (normalized by max possible hits in a clip).
+
+    A segment overlaps a window iff seg.start <= end and seg.end >= start. Segments with
+    seg.end < start always also have seg.start <= end, so per keyword:
+        overlapping hits = #(seg.start <= end) - #(seg.end < start)
+    Both counts come from cumulative keyword-presence tables (segments sorted by start
+    and by end) indexed with np.searchsorted, so all windows are scored at once.
+    """
+    kw = sorted(frozenset(k.lower() for k in keywords))
+    if not kw or not segments:
+        return np.zeros(len(starts_sec))
+
+    # Tokenize each segment once: presence[s, k] is 1 if keyword k is spoken in segment s.
+    seg_words = [_words_in_text(seg.text) for seg in segments]
+    presence = np.array([[w in words for w in kw] for words in seg_words], dtype=np.int32)
+    seg_starts = np.array([seg.start for seg in segments])
+    seg_ends = np.array([seg.end for seg in segments])
+
+    by_start = np.argsort(seg_starts, kind="stable")
+    by_end = np.argsort(seg_ends, kind="stable")
+    zero = np.zeros((1, len(kw)), dtype=np.int32)
+    started_cs = np.concatenate((zero, np.cumsum(presence[by_start], axis=0)))
+    ended_cs = np.concatenate((zero, np.cumsum(presence[by_end], axis=0)))
+
+    n_started = np.searchsorted(seg_starts[by_start], ends_sec, side="right")
+    n_ended = np.searchsorted(seg_ends[by_end], starts_sec, side="left")
+    hits = ((started_cs[n_started] - ended_cs[n_ended]) > 0).sum(axis=1)
+    return np.minimum(1.0, hits / max(1, len(kw) * 0.3))
+
+
+def _load_mono(audio_path: Path) -> Tuple[np.ndarray, int]:
+    """Read a WAV as float32 mono PCM at its own sample rate (multichannel is downmixed)."""
+    # extract_audio already emits 16 kHz mono PCM, so no resampling is needed here;
+    # framing is driven by the file's own sample rate.
+    y, sr = sf.read(str(audio_path), dtype="float32", always_2d=False)
+    if y.ndim > 1:
+        y = y.mean(axis=1)
+    return y, sr
+
+
+def _frame_features(
+    y: np.ndarray,
+    sr: int,
+    frame_duration_seconds: float = 1.0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-frame (energy, speech_activity) arrays; independent of the transcript."""
+    frames = _frame_signal(y, sr=sr, window_seconds=frame_duration_seconds)
+    if frames.shape[0] == 0:
+        empty = np.zeros(0, dtype=np.float32)
+        return empty, empty
+    energy = _compute_window_energy(frames)
+    return energy, _compute_speech_activity(energy)
 
 
 def _extract_top_clips_from_audio(
     audio_path: Path,
-    target_sr: int = 16000,
     frame_duration_seconds: float = 1.0,
     clip_length_seconds: float = 15.0,
     step_seconds: float = 5.0,
@@ -165,14 +223,24 @@ def _extract_top_clips_from_audio(
     segments: Optional[List[TranscriptSegment]] = None,
     keywords: Optional[List[str]] = None,
     top_k: int = 3,
+    y: Optional[np.ndarray] = None,
+    sr: int = WHISPER_SAMPLE_RATE,
+    features: Optional[Tuple[np.ndarray, np.ndarray]] = None,
 ) -> List[Clip]:
     """
     Core algorithm working on a prepared audio file.
     If segments and keywords are provided (from Whisper), keyword_score is computed and blended.
+    If y (mono PCM at sample rate sr) is provided, audio_path is not read again; if
+    features (from _frame_features) are provided, framing is skipped as well.
     """
-    y, sr = librosa.load(str(audio_path), sr=target_sr, mono=True)
-
-    if len(y) == 0:
+    if features is None:
+        if y is None:
+            y, sr = _load_mono(audio_path)
+        features = _frame_features(y, sr, frame_duration_seconds)
+    energy, speech_activity = features
+    num_frames = len(energy)
+
+    if num_frames == 0:
         return []
 
     use_keywords = w_keyword > 0 and segments is not None and keywords is not None
@@ -182,42 +250,50 @@ def _extract_top_clips_from_audio(
     else:
         w_keyword = 0.0
 
-    frames = _frame_signal(y, sr=sr, window_seconds=frame_duration_seconds)
-    num_frames = frames.shape[0]
-
-    energy = _compute_window_energy(frames)
-    speech_activity = _compute_speech_activity(energy)
-
-    indices = _sliding_window_indices(
+    starts, ends = _sliding_window_indices(
         num_frames=num_frames,
         clip_length_seconds=clip_length_seconds,
         step_seconds=step_seconds,
         frame_duration_seconds=frame_duration_seconds,
     )
 
-    clips: List[Clip] = []
-    for start_idx, end_idx in indices:
-        window_energy = energy[start_idx:end_idx]
-        window_speech = speech_activity[start_idx:end_idx]
+    if starts.size == 0:
+        return []
 
-        if len(window_energy) == 0:
-            continue
+    lengths = ends - starts
 
-        energy_score = float(window_energy.mean())
-        speech_density_score = float(window_speech.mean())
+    # Prefix sums turn every window mean into a single subtraction (O(N) overall).
+    energy_cs = np.concatenate(([0.0], np.cumsum(energy)))
+    speech_cs = np.concatenate(([0.0], np.cumsum(speech_activity)))
+    energy_scores = (energy_cs[ends] - energy_cs[starts]) / lengths
+    speech_scores = (speech_cs[ends] - speech_cs[starts]) / lengths
 
-        start_sec = start_idx * frame_duration_seconds
-        end_sec = end_idx * frame_duration_seconds
+    starts_sec = starts * frame_duration_seconds
+    ends_sec = ends * frame_duration_seconds
 
-        keyword_score = 0.0
-        if use_keywords and segments and keywords:
-            keyword_score = _keyword_score_for_clip(start_sec, end_sec, segments, keywords)
+    if use_keywords and segments and keywords:
+        keyword_scores = _keyword_scores(starts_sec, ends_sec, segments, keywords)
+    else:
+        keyword_scores = np.zeros(len(starts))
 
-        score = (
-            w_energy * energy_score
-            + w_speech * speech_density_score
-            + w_keyword * keyword_score
-        )
+    scores = w_energy * energy_scores + w_speech * speech_scores + w_keyword * keyword_scores
+
+    # Partial selection: only the top_k windows are ranked and turned into Clips.
+    if top_k <= 0:
+        return []
+    if top_k < len(scores):
+        top = np.sort(np.argpartition(scores, -top_k)[-top_k:])
+    else:
+        top = np.arange(len(scores))
+    top = top[np.argsort(-scores[top], kind="stable")]
+
+    clips: List[Clip] = []
+    for i in top:
+        start_sec = float(starts_sec[i])
+        end_sec = float(ends_sec[i])
+        energy_score = float(energy_scores[i])
+        speech_density_score = float(speech_scores[i])
+        keyword_score = float(keyword_scores[i])
 
         reason = _build_reason(
             start=start_sec,
@@ -231,7 +307,7 @@ def _extract_top_clips_from_audio(
             Clip(
                 start=start_sec,
                 end=end_sec,
-                score=score,
+                score=float(scores[i]),
                 energy_score=energy_score,
                 speech_density_score=speech_density_score,
                 reason=reason,
@@ -239,8 +315,7 @@ def _extract_top_clips_from_audio(
             )
         )
 
-    clips.sort(key=lambda c: c.score, reverse=True)
-    return clips[:top_k]
+    return clips
 
 
 def process_video_file(video_path: Path) -> List[Clip]:
@@ -251,13 +326,27 @@ def process_video_file(video_path: Path) -> List[Clip]:
     - Run highlight discovery (energy + speech + keyword relevance)
     - Return the Top 3 clips
     """
-    audio_path = video_path.with_suffix(".analysis.wav")
-    extract_audio(video_path, audio_path)
+    # Hash the video once: the WAV, result and transcript caches are all keyed by it
+    # (the analysis audio is derived deterministically from the video).
+    digest = disk_cache.file_digest(video_path)
+    if MAX_WAV_CACHE_BYTES:
+        audio_path = extract_audio_cached(video_path, digest=digest)
+        return _run_highlight_discovery(
+            audio_path,
+            w_energy=0.35,
+            w_speech=0.35,
+            w_keyword=0.3,
+            digest=digest,
+        )
+
+    # No WAV cache to fill: decode through a pipe straight into memory, no WAV on disk.
     return _run_highlight_discovery(
-        audio_path,
+        video_path,
         w_energy=0.35,
         w_speech=0.35,
         w_keyword=0.3,
+        decode=decode_to_array,
+        digest=digest,
     )
 
 
@@ -281,29 +370,73 @@ def _run_highlight_discovery(
     w_speech: float = 0.35,
     w_keyword: float = 0.3,
     whisper_model: str | None = None,
+    decode: Optional[Callable[[Path], np.ndarray]] = None,
+    digest: Optional[str] = None,
 ) -> List[Clip]:
     """
     Run ASR with Whisper, extract keywords, then score clips.
     On Whisper failure, falls back to energy + speech only (keyword_score=0).
     whisper_model: "tiny" | "base" | "small" | ...; default from env WHISPER_MODEL or "tiny".
+    Results are cached by audio content + parameters, so re-submitting the same media
+    skips Whisper and scoring entirely (fallback results are not cached).
+    decode: turns audio_path into 16 kHz mono float32 PCM (default: Whisper's decoder,
+    falling back to reading the WAV directly if that is unavailable).
+    digest: content digest the caches are keyed by (default: disk_cache.file_digest of
+    audio_path); computed once here and shared with the transcript cache.
     """
     import os
     model_size = whisper_model or os.environ.get("WHISPER_MODEL", "tiny")
+
+    if digest is None:
+        digest = disk_cache.file_digest(audio_path)
+    cache_key = disk_cache.make_key(
+        digest, transcript_variant(model_size), w_energy, w_speech, w_keyword
+    )
+    cached = disk_cache.load(cache_key)
+    if cached is not None:
+        return cached["clips"]
+
+    # Decode once; the same PCM feeds both Whisper and the energy/speech scoring.
+    pcm: Optional[np.ndarray] = None
+    if decode is not None:
+        pcm = decode(audio_path)
+    else:
+        try:
+            pcm = load_audio(audio_path)
+        except Exception:
+            pcm = None
+    if pcm is not None:
+        y, sr = pcm, WHISPER_SAMPLE_RATE
+    else:
+        y, sr = _load_mono(audio_path)
+
     segments: Optional[List[TranscriptSegment]] = None
     keywords: Optional[List[str]] = None
-    try:
-        segments = transcribe(audio_path, model_size=model_size)
-        if segments:
-            keywords = extract_keywords(segments, top_k=20)
-    except Exception:
-        segments = None
-        keywords = None
-
-    return _extract_top_clips_from_audio(
+    transcribed = False
+    # Energy/speech framing does not depend on the transcript, so it runs alongside Whisper.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        features_future = pool.submit(_frame_features, y, sr)
+        try:
+            segments = transcribe(audio_path, model_size=model_size, audio=pcm, digest=digest)
+            transcribed = True
+            if segments:
+                keywords = extract_keywords(segments, top_k=20)
+        except Exception:
+            segments = None
+            keywords = None
+        features = features_future.result()
+
+    clips = _extract_top_clips_from_audio(
         audio_path,
         w_energy=w_energy,
         w_speech=w_speech,
         w_keyword=w_keyword if (segments and keywords) else 0.0,
         segments=segments,
         keywords=keywords,
+        features=features,
     )
+    if transcribed:
+        disk_cache.store(
+            cache_key, {"segments": segments, "keywords": keywords, "clips": clips}
+        )
+    return clips
@@ -1,11 +1,100 @@
+import asyncio
+import multiprocessing
+import os
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict
 from pathlib import Path
-from typing import List, Literal
+from typing import Any, Callable, List, Literal, Optional
 
 from backend.domain.models import Job, JobStatus, Clip
-from backend.domain.services.clip_ranker import process_audio_file, process_video_file
-from backend.infrastructure.persistence.in_memory_repo import job_repository
-from backend.infrastructure.downloaders import download_youtube, download_dropbox
+from backend.domain.services.job_worker import download_and_process, process_video
+from backend.infrastructure.persistence.sqlite_repo import job_repository
+
+# CPU-bound work (ffmpeg, Whisper, scoring) runs in worker processes so it never
+# competes with request handling for the GIL or the default threadpool.
+# The worker entry points live in job_worker and import clip_ranker / downloaders lazily,
+# so neither the API process nor the workers load more than they need (workers never
+# import this module or the job repository).
+# Each worker loads its own Whisper model, so the pool is small by default: set JOB_WORKERS
+# in env to override the pool size (default 2), and MAX_CONCURRENT_JOBS to cap how many
+# jobs are in flight at once (default: JOB_WORKERS).
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "0")) or 2
+MAX_CONCURRENT_JOBS = int(os.environ.get("MAX_CONCURRENT_JOBS", "0")) or JOB_WORKERS
+
+_executor: Optional[ProcessPoolExecutor] = None
+_job_slots: Optional[asyncio.BoundedSemaphore] = None
+
+
+def start_worker_pool() -> ProcessPoolExecutor:
+    """
+    Create the job process pool (idempotent). Called from the app's startup; workers
+    are spawned, not forked, so they never inherit the server's threads or event loop.
+    """
+    global _executor, _job_slots
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=JOB_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        _job_slots = asyncio.BoundedSemaphore(MAX_CONCURRENT_JOBS)
+    return _executor
+
+
+def shutdown_worker_pool() -> None:
+    """Stop the job process pool, cancelling jobs that have not started yet."""
+    global _executor, _job_slots
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+        _job_slots = None
+
+
+def _replace_broken_pool(broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+    """
+    Swap a broken pool (a worker died, e.g. OOM-killed) for a fresh one and return it.
+    Jobs that saw the same broken pool share one replacement: only the first one through
+    here (checked by identity) recreates it. Runs on the event loop, so no lock is needed.
+    """
+    global _executor
+    if _executor is broken:
+        broken.shutdown(wait=False, cancel_futures=True)
+        _executor = ProcessPoolExecutor(
+            max_workers=JOB_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return start_worker_pool()
+
+
+async def submit_job(fn: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run fn(*args) in the job process pool without blocking the event loop.
+    At most MAX_CONCURRENT_JOBS run at once; the rest wait here, not in the pool queue.
+    If a worker dies, every job in flight sees BrokenProcessPool: the pool is recreated
+    and the job retried once, so one crash doesn't fail all later jobs until a restart.
+    """
+    executor = start_worker_pool()
+    loop = asyncio.get_running_loop()
+    async with _job_slots:
+        try:
+            return await loop.run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            executor = _replace_broken_pool(executor)
+            return await loop.run_in_executor(executor, fn, *args)
+
+
+def recover_interrupted_jobs() -> int:
+    """
+    Mark jobs left PROCESSING by a previous server run as FAILED (their worker is gone).
+    Called once from the app's startup; returns how many jobs were marked.
+    """
+    return job_repository.recover_interrupted_jobs()
+
+
+def close_job_store() -> None:
+    """Flush queued job writes to the database. Called once from the app's shutdown."""
+    job_repository.close()
 
 
 def create_job() -> Job:
@@ -18,10 +107,10 @@ def create_job() -> Job:
     return job
 
 
-def run_job(job_id: str, video_path: Path) -> None:
+async def run_job(job_id: str, video_path: Path) -> None:
     """
     Background processing for a job:
-    - Run highlight discovery
+    - Run highlight discovery in the process pool
     - Update job status and attach clips or error message
     """
     job = job_repository.get(job_id)
@@ -29,9 +118,8 @@ def run_job(job_id: str, video_path: Path) -> None:
         return
 
     try:
-        clips: List[Clip] = process_video_file(video_path)
-        job.clips = clips
-        job.status = JobStatus.COMPLETED
+        clips: List[Clip] = await submit_job(process_video, video_path)
+        _complete_job(job, clips)
     except Exception as exc:  # noqa: BLE001 - top-level guard
         job.status = JobStatus.FAILED
         job.error_message = str(exc)
@@ -39,11 +127,25 @@ def run_job(job_id: str, video_path: Path) -> None:
         job_repository.save(job)
 
 
+def fail_job(job: Job, error_message: str) -> None:
+    """Mark a job FAILED with the given error and persist it."""
+    job.status = JobStatus.FAILED
+    job.error_message = error_message
+    job_repository.save(job)
+
+
+def _complete_job(job: Job, clips: List[Clip]) -> None:
+    """Attach clips (and their cached JSON form) and mark the job completed."""
+    job.clips = clips
+    job.clips_payload = [asdict(c) for c in clips]
+    job.status = JobStatus.COMPLETED
+
+
 def get_job(job_id: str) -> Job | None:
     return job_repository.get(job_id)
 
 
-def run_job_from_link(
+async def run_job_from_link(
     job_id: str,
     url: str,
     source: Literal["youtube", "dropbox"],
@@ -55,24 +157,11 @@ def run_job_from_link(
     if not job:
         return
 
-    jobs_dir = Path("jobs")
-    jobs_dir.mkdir(parents=True, exist_ok=True)
-
     try:
-        if source == "youtube":
-            audio_path = jobs_dir / f"{job_id}.wav"
-            download_youtube(url, audio_path)
-            clips: List[Clip] = process_audio_file(audio_path)
-        else:  # dropbox
-            video_path = jobs_dir / f"{job_id}_dropbox.mp4"
-            download_dropbox(url, video_path)
-            clips = process_video_file(video_path)
-
-        job.clips = clips
-        job.status = JobStatus.COMPLETED
+        clips: List[Clip] = await submit_job(download_and_process, job_id, url, source)
+        _complete_job(job, clips)
     except Exception as exc:
         job.status = JobStatus.FAILED
         job.error_message = str(exc)
     finally:
         job_repository.save(job)
-
@@ -0,0 +1,45 @@
+"""
+Worker-process entry points for the job pool.
+
+Kept apart from job_service so that unpickling them in a spawned worker imports only
+this module: workers never open the job repository, and clip_ranker / downloaders
+(numpy, soundfile, yt-dlp, Whisper) are imported lazily on first use.
+"""
+from pathlib import Path
+from typing import List, Literal
+
+from backend.domain.models import Clip
+
+
+def process_video(video_path: Path) -> List[Clip]:
+    """
+    Worker-process body for upload jobs: run highlight discovery on the saved video.
+    """
+    from backend.domain.services.clip_ranker import process_video_file
+
+    return process_video_file(video_path)
+
+
+def download_and_process(
+    job_id: str,
+    url: str,
+    source: Literal["youtube", "dropbox"],
+) -> List[Clip]:
+    """
+    Worker-process body for link jobs: download the media, then run highlight discovery.
+    """
+    from backend.domain.services.clip_ranker import process_audio_file, process_video_file
+    from backend.infrastructure.downloaders import download_dropbox, download_youtube
+
+    jobs_dir = Path("jobs")
+    jobs_dir.mkdir(parents=True, exist_ok=True)
+
+    if source == "youtube":
+        audio_path = jobs_dir / f"{job_id}.wav"
+        download_youtube(url, audio_path)
+        return process_audio_file(audio_path)
+
+    # dropbox
+    video_path = jobs_dir / f"{job_id}_dropbox.mp4"
+    download_dropbox(url, video_path)
+    return process_video_file(video_path)
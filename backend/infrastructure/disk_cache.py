@@ -0,0 +1,124 @@
+"""
+Content-addressed disk cache for expensive analysis results (Whisper + clip scoring).
+
+Entries are pickled under jobs/.cache and evicted least-recently-used once the
+directory grows past CLIPSCOUT_CACHE_MB (default 512; 0 disables the cache).
+"""
+import hashlib
+import mmap
+import os
+import pickle
+import shutil
+import uuid
+from pathlib import Path
+from typing import Any, Optional
+
+CACHE_DIR = Path("jobs") / ".cache"
+CACHE_MB = int(os.environ.get("CLIPSCOUT_CACHE_MB", "512"))
+MAX_CACHE_BYTES = CACHE_MB * 1024 * 1024
+
+
+def _hash_file(path: Path, h: Any) -> str:
+    """
+    Feed a file's contents to hasher h and return the hex digest.
+    The file is mmapped, so hashing never copies it into Python memory (safe for multi-GB
+    files); hashlib releases the GIL while digesting the mapping.
+    """
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size:  # mmap rejects empty files
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+    return h.hexdigest()
+
+
+def file_digest(path: Path) -> str:
+    """Return a short blake2b hex digest of a file's contents (cache keys)."""
+    return _hash_file(path, hashlib.blake2b(digest_size=16))
+
+
+def make_key(*parts: Any) -> str:
+    """Combine a content digest and the parameters that affect the result into one key."""
+    return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+
+def load(key: str) -> Optional[Any]:
+    """Return the cached value for key, or None on a miss (or if the cache is disabled)."""
+    if not MAX_CACHE_BYTES:
+        return None
+    path = CACHE_DIR / f"{key}.pkl"
+    try:
+        with path.open("rb") as f:
+            value = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:  # noqa: BLE001 - corrupt / stale entry, drop it
+        path.unlink(missing_ok=True)
+        return None
+    try:
+        os.utime(path)  # mark as recently used for LRU eviction
+    except OSError:
+        pass
+    return value
+
+
+def store(key: str, value: Any) -> None:
+    """
+    Persist value under key (atomic rename), then trim the cache to its size cap.
+    Best effort: a full or read-only disk never fails the caller.
+    """
+    if not MAX_CACHE_BYTES:
+        return
+    path = CACHE_DIR / f"{key}.pkl"
+    tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with tmp.open("wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        evict_lru(CACHE_DIR, MAX_CACHE_BYTES)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+def link_or_copy(src: Path, dst: Path) -> None:
+    """
+    Hard-link src to dst (replacing dst), copying instead across filesystems.
+    Gives a caller its own name for a cache entry, so eviction can't delete it mid-use.
+    """
+    dst.unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except FileNotFoundError:
+        raise  # src is gone (e.g. evicted): let the caller treat it as a miss
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def evict_lru(directory: Path, max_bytes: int, *, keep: Optional[Path] = None) -> None:
+    """
+    Delete the least-recently-accessed files in directory until it fits in max_bytes.
+    keep (e.g. the entry a caller is about to use) is never deleted.
+    """
+    entries = []
+    total = 0
+    for path in directory.iterdir():
+        if path.name.endswith(".tmp"):
+            continue  # in-flight write from another worker
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_atime, st.st_size, path))
+        total += st.st_size
+
+    if total <= max_bytes:
+        return
+
+    entries.sort(key=lambda e: e[0])
+    for _, size, path in entries:
+        if keep is not None and path == keep:
+            continue
+        path.unlink(missing_ok=True)
+        total -= size
+        if total <= max_bytes:
+            break
@@ -1,17 +1,60 @@
 """
 Download video/audio from external URLs (YouTube, Dropbox, etc.).
 """
+import hashlib
+import json
 import os
+import re
+import threading
+import uuid
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
 import requests
 import yt_dlp
 
+from backend.infrastructure import disk_cache
+
+# Downloaded YouTube WAVs are kept by video ID so repeat URLs skip yt-dlp + ffmpeg.
+# Set CLIPSCOUT_YTCACHE_MB in env to cap the cache (default 2048; 0 disables it).
+YT_CACHE_DIR = Path("jobs") / ".ytcache"
+YT_CACHE_MB = int(os.environ.get("CLIPSCOUT_YTCACHE_MB", "2048"))
+MAX_YT_CACHE_BYTES = YT_CACHE_MB * 1024 * 1024
+
+# Downloaded Dropbox files are kept with their ETag / Last-Modified, so a repeat link costs
+# one conditional HEAD (304) instead of the whole file. Each direct-download URL maps (by
+# hash) to a body under jobs/.dbxcache/files and a small validator file under
+# jobs/.dbxcache/meta, so concurrent workers never rewrite a shared index.
+# Set CLIPSCOUT_DBXCACHE_MB in env to cap the cache (default 2048; 0 disables it).
+DBX_CACHE_DIR = Path("jobs") / ".dbxcache"
+DBX_CACHE_FILES_DIR = DBX_CACHE_DIR / "files"
+DBX_CACHE_META_DIR = DBX_CACHE_DIR / "meta"
+DBX_CACHE_MB = int(os.environ.get("CLIPSCOUT_DBXCACHE_MB", "2048"))
+MAX_DBX_CACHE_BYTES = DBX_CACHE_MB * 1024 * 1024
+
+# Dropbox files are fetched as parallel HTTP range requests written in place with pwrite.
+DROPBOX_PARALLEL_PARTS = 8
+DROPBOX_MIN_PARALLEL_BYTES = 8 * 1024 * 1024  # smaller files aren't worth splitting
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# watch?v=ID, youtu.be/ID, /shorts/ID, /embed/ID, /live/ID
+_YT_ID_RE = re.compile(r"(?:[?&]v=|youtu\.be/|/shorts/|/embed/|/live/)([A-Za-z0-9_-]{11})")
+
+
+def _extract_video_id(url: str) -> Optional[str]:
+    """Return the 11-character YouTube video ID in url, or None if there isn't one."""
+    match = _YT_ID_RE.search(url)
+    return match.group(1) if match else None
+
 
 def download_youtube(url: str, output_path: Path) -> None:
     """
-    Download audio from a YouTube URL to a WAV file using yt-dlp.
+    Download audio from a YouTube URL to a 16 kHz mono WAV file using yt-dlp.
     output_path should end in .wav; yt-dlp will produce that file.
+    Repeat URLs are served from jobs/.ytcache (keyed by video ID) via a hard link.
 
     If YouTube asks to "sign in to confirm you're not a bot" (common on EC2/datacenter IPs),
     set YT_COOKIES_FILE to the path of a Netscape-format cookies file exported from your
@@ -19,6 +62,29 @@ def download_youtube(url: str, output_path: Path) -> None:
     """
     output_path = output_path.with_suffix(".wav")
     output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    video_id = _extract_video_id(url) if MAX_YT_CACHE_BYTES else None
+    cache_path = YT_CACHE_DIR / f"{video_id}.wav" if video_id else None
+    if cache_path is not None:
+        try:
+            disk_cache.link_or_copy(cache_path, output_path)
+            os.utime(cache_path)  # mark as recently used for LRU eviction
+            return
+        except FileNotFoundError:
+            pass  # not cached yet (or just evicted)
+
+    _ytdlp_download_wav(url, output_path)
+
+    if cache_path is not None:
+        try:
+            YT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            disk_cache.link_or_copy(output_path, cache_path)
+            disk_cache.evict_lru(YT_CACHE_DIR, MAX_YT_CACHE_BYTES, keep=cache_path)
+        except OSError:
+            pass  # caching is best effort
+
+
+def _ytdlp_download_wav(url: str, output_path: Path) -> None:
     opts = {
         "format": "bestaudio/best",
         "outtmpl": str(output_path.with_suffix("")),
@@ -29,6 +95,9 @@ def download_youtube(url: str, output_path: Path) -> None:
                 "preferredquality": None,
             }
         ],
+        # Downmix/resample in the same ffmpeg pass to the 16 kHz mono that Whisper and
+        # the clip ranker use, so the WAV needs no further conversion (and is ~6x smaller).
+        "postprocessor_args": {"extractaudio": ["-ac", "1", "-ar", "16000"]},
         "quiet": True,
     }
     cookies_file = os.environ.get("YT_COOKIES_FILE")
@@ -40,19 +109,254 @@ def download_youtube(url: str, output_path: Path) -> None:
         raise RuntimeError("yt-dlp did not produce a WAV file")
 
 
+class _RangeNotSupported(Exception):
+    """The server ignored a Range header (200 instead of 206) or answered a different span."""
+
+
 def download_dropbox(url: str, output_path: Path) -> None:
     """
     Download file from a Dropbox shared link.
-    Converts share links to direct download by appending ?dl=1 if needed.
+    Converts share links to direct download by setting dl=1 in the query string.
     Saves to output_path (extension may not match; ffmpeg will detect format).
+    Large files are fetched as DROPBOX_PARALLEL_PARTS concurrent range requests;
+    falls back to a single stream when the server doesn't support ranges.
+    A link downloaded before is revalidated by the same HEAD (If-None-Match /
+    If-Modified-Since) and, if unchanged (304), hard-linked from jobs/.dbxcache;
+    if it changed, it is downloaded as above and the cache entry replaced.
     """
-    download_url = url.strip()
-    if "dropbox.com" in download_url and "?dl=" not in download_url:
-        download_url = download_url + ("&" if "?" in download_url else "?") + "dl=1"
+    download_url = _dropbox_direct_url(url.strip())
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    resp = requests.get(download_url, stream=True, timeout=120, allow_redirects=True)
-    resp.raise_for_status()
-    with open(output_path, "wb") as f:
-        for chunk in resp.iter_content(chunk_size=8192):
+
+    # One HEAD answers both questions: is the cached copy still current (304), and can
+    # the body be fetched as parallel ranges.
+    entry = _dbx_cache_lookup(download_url)
+    headers = {}
+    if entry is not None:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    head = _head(download_url, headers)
+    if head is not None and entry is not None and head.status_code == 304:
+        cache_path = Path(entry["path"])
+        try:
+            disk_cache.link_or_copy(cache_path, output_path)
+            os.utime(cache_path)  # mark as recently used for LRU eviction
+            return
+        except FileNotFoundError:
+            # Evicted since the lookup; a 304 carries no size, so ask again unconditionally.
+            head = _head(download_url)
+
+    ok = head is not None and head.ok
+    total = int(head.headers.get("Content-Length") or 0) if ok else 0
+    accepts_ranges = ok and head.headers.get("Accept-Ranges", "").lower() == "bytes"
+    if accepts_ranges and total >= DROPBOX_MIN_PARALLEL_BYTES:
+        try:
+            # head.url is the post-redirect direct-download URL.
+            _download_ranges(head.url, output_path, total)
+            _dbx_cache_store(download_url, output_path, head.headers)
+            return
+        except _RangeNotSupported:
+            pass
+
+    validators = _download_stream(download_url, output_path)
+    _dbx_cache_store(download_url, output_path, validators)
+
+
+def _head(url: str, headers: Optional[Dict[str, str]] = None) -> Optional[requests.Response]:
+    """HEAD url (following redirects); None on a network error, so callers fall back to GET."""
+    try:
+        return requests.head(url, headers=headers, timeout=30, allow_redirects=True)
+    except requests.RequestException:
+        return None
+
+
+def _dropbox_direct_url(url: str) -> str:
+    """Return a dropbox.com share link with dl=1 (direct download); other URLs unchanged."""
+    parts = urlparse(url)
+    host = parts.hostname or ""  # lowercased, without port / userinfo
+    if host != "dropbox.com" and not host.endswith(".dropbox.com"):
+        return url
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    query["dl"] = "1"
+    return urlunparse(parts._replace(query=urlencode(query)))
+
+
+def _dbx_cache_paths(url: str) -> Tuple[Path, Path]:
+    """Return (body path, validator file path) for a direct-download URL."""
+    name = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+    return DBX_CACHE_FILES_DIR / name, DBX_CACHE_META_DIR / f"{name}.json"
+
+
+def _dbx_cache_lookup(url: str) -> Optional[Dict[str, Any]]:
+    """Return the validator entry for url if its cached body is still present, else None."""
+    if not MAX_DBX_CACHE_BYTES:
+        return None
+    cache_path, meta_path = _dbx_cache_paths(url)
+    try:
+        entry = json.loads(meta_path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):  # corrupt entry, drop it
+        meta_path.unlink(missing_ok=True)
+        return None
+    if entry.get("url") != url or not (entry.get("etag") or entry.get("last_modified")):
+        return None
+    try:
+        if cache_path.stat().st_size != entry.get("size"):
+            return None
+    except FileNotFoundError:  # body was evicted; the validators are useless now
+        meta_path.unlink(missing_ok=True)
+        return None
+    except OSError:
+        return None
+    entry["path"] = str(cache_path)
+    return entry
+
+
+def _dbx_cache_store(url: str, output_path: Path, headers: Any) -> None:
+    """
+    Hard-link a finished download into the cache and record its validators.
+    Responses without an ETag or Last-Modified can't be revalidated and aren't cached.
+    Best effort: a full or read-only disk never fails the download.
+    """
+    if not MAX_DBX_CACHE_BYTES:
+        return
+    etag = headers.get("ETag")
+    last_modified = headers.get("Last-Modified")
+    if not (etag or last_modified):
+        return
+    cache_path, meta_path = _dbx_cache_paths(url)
+    tmp = meta_path.with_name(f"{meta_path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        DBX_CACHE_FILES_DIR.mkdir(parents=True, exist_ok=True)
+        DBX_CACHE_META_DIR.mkdir(parents=True, exist_ok=True)
+        disk_cache.link_or_copy(output_path, cache_path)
+        entry = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "size": cache_path.stat().st_size,
+        }
+        tmp.write_text(json.dumps(entry), encoding="utf-8")
+        os.replace(tmp, meta_path)
+        disk_cache.evict_lru(DBX_CACHE_FILES_DIR, MAX_DBX_CACHE_BYTES, keep=cache_path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+def _download_stream(url: str, output_path: Path) -> Any:
+    """Stream url to output_path in one request; returns the response headers."""
+    with requests.get(url, stream=True, timeout=120, allow_redirects=True) as resp:
+        resp.raise_for_status()
+        _write_stream(resp, output_path)
+        return resp.headers
+
+
+def _write_stream(resp: requests.Response, output_path: Path) -> None:
+    """
+    Write a streamed response body to output_path through a 1 MiB buffer.
+    When the body size is known up front, the file is preallocated (posix_fallocate)
+    so the filesystem reserves contiguous blocks once instead of growing the file per write.
+    """
+    total = 0
+    if resp.headers.get("Content-Encoding", "identity") == "identity":
+        total = int(resp.headers.get("Content-Length") or 0)  # else decoded size differs
+    with open(output_path, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+        if total > 0 and hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(f.fileno(), 0, total)
+            except OSError:
+                pass  # e.g. unsupported by the filesystem; just grow as we write
+        written = 0
+        for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
             if chunk:
                 f.write(chunk)
+                written += len(chunk)
+        if written != total:
+            f.truncate(written)  # drop preallocated tail if the body came up short
+
+
+def _download_ranges(url: str, output_path: Path, total: int) -> None:
+    """
+    Fetch [0, total) as parallel range requests into a file pre-sized to total bytes.
+    The first part is requested alone as a probe: a server that ignores Range (200 with
+    the full body) is detected after one request, before the other parts are started.
+    The first failing part stops the rest.
+    """
+    part_size = -(-total // DROPBOX_PARALLEL_PARTS)  # ceil division
+    ranges = [(lo, min(lo + part_size, total) - 1) for lo in range(0, total, part_size)]
+
+    first = _open_range(url, *ranges[0], total)  # raises _RangeNotSupported
+    stop = threading.Event()
+    fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.ftruncate(fd, total)
+        with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+            futures = [pool.submit(_write_range, first, fd, *ranges[0], stop)]
+            futures += [
+                pool.submit(_fetch_range, url, fd, lo, hi, total, stop) for lo, hi in ranges[1:]
+            ]
+            done, _pending = wait(futures, return_when=FIRST_EXCEPTION)
+            failed = [f for f in done if f.exception() is not None]
+            if failed:
+                stop.set()  # running parts bail out at their next chunk
+                raise failed[0].exception()
+    finally:
+        first.close()
+        os.close(fd)
+
+
+def _open_range(url: str, lo: int, hi: int, total: int) -> requests.Response:
+    """
+    Start a streamed GET for bytes lo..hi (inclusive) of a total-byte resource, checking
+    that the server really answered with that span (206 + matching Content-Range).
+    """
+    resp = requests.get(url, headers={"Range": f"bytes={lo}-{hi}"}, stream=True, timeout=120)
+    try:
+        resp.raise_for_status()
+        if resp.status_code != 206:
+            raise _RangeNotSupported(url)
+        content_range = resp.headers.get("Content-Range", "")
+        if content_range not in (f"bytes {lo}-{hi}/{total}", f"bytes {lo}-{hi}/*"):
+            raise _RangeNotSupported(
+                f"asked for bytes {lo}-{hi}/{total}, got Content-Range {content_range!r}"
+            )
+        length = resp.headers.get("Content-Length")
+        if length is not None and int(length) != hi - lo + 1:
+            raise _RangeNotSupported(
+                f"asked for {hi - lo + 1} bytes at {lo}, got Content-Length {length}"
+            )
+    except BaseException:
+        resp.close()
+        raise
+    return resp
+
+
+def _fetch_range(
+    url: str, fd: int, lo: int, hi: int, total: int, stop: threading.Event
+) -> None:
+    """Download bytes lo..hi (inclusive) of url and pwrite them at the same offsets in fd."""
+    if stop.is_set():
+        return
+    _write_range(_open_range(url, lo, hi, total), fd, lo, hi, stop)
+
+
+def _write_range(
+    resp: requests.Response, fd: int, lo: int, hi: int, stop: threading.Event
+) -> None:
+    """pwrite a validated range response (bytes lo..hi) into fd at the same offsets."""
+    offset = lo
+    with resp:
+        for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            if stop.is_set():
+                return  # another part failed; the download is being abandoned
+            if offset + len(chunk) > hi + 1:
+                raise _RangeNotSupported(f"range {lo}-{hi} returned more than {hi - lo + 1} bytes")
+            view = memoryview(chunk)
+            while view:
+                written = os.pwrite(fd, view, offset)
+                view = view[written:]
+                offset += written
+    if offset != hi + 1:
+        raise RuntimeError(f"Dropbox download truncated: got bytes {lo}-{offset - 1} of {lo}-{hi}")
@@ -1,6 +1,18 @@
+import os
+import uuid
 from pathlib import Path
+from typing import Optional
 
 import ffmpeg
+import numpy as np
+
+from backend.infrastructure import disk_cache
+
+# Extracted analysis WAVs are reused across jobs for the same source video.
+# Set CLIPSCOUT_WAVCACHE_MB in env to cap the cache (default 2048; 0 disables it).
+WAV_CACHE_DIR = Path("jobs") / ".wavcache"
+WAV_CACHE_MB = int(os.environ.get("CLIPSCOUT_WAVCACHE_MB", "2048"))
+MAX_WAV_CACHE_BYTES = WAV_CACHE_MB * 1024 * 1024
 
 
 def extract_audio(input_video: Path, output_audio: Path, *, sample_rate: int = 16000) -> None:
@@ -14,6 +26,7 @@ def extract_audio(input_video: Path, output_audio: Path, *, sample_rate: int = 1
                 str(output_audio),
                 ac=1,  # mono
                 ar=sample_rate,
+                acodec="pcm_s16le",
                 format="wav",
             )
             .overwrite_output()
@@ -22,3 +35,59 @@ def extract_audio(input_video: Path, output_audio: Path, *, sample_rate: int = 1
     except ffmpeg.Error as e:
         raise RuntimeError(f"ffmpeg failed: {e}") from e
 
+
+def decode_to_array(input_video: Path, *, sample_rate: int = 16000) -> np.ndarray:
+    """
+    Decode a video's audio straight into memory as float32 mono PCM in [-1, 1).
+    ffmpeg writes raw s16le to a pipe, so no intermediate WAV is written or re-read.
+    """
+    try:
+        out, _ = (
+            ffmpeg.input(str(input_video))
+            .output("pipe:", format="s16le", acodec="pcm_s16le", ac=1, ar=sample_rate)
+            .run(capture_stdout=True, quiet=True)
+        )
+    except ffmpeg.Error as e:
+        raise RuntimeError(f"ffmpeg failed: {e}") from e
+    return np.frombuffer(out, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def extract_audio_cached(
+    input_video: Path,
+    *,
+    sample_rate: int = 16000,
+    digest: Optional[str] = None,
+) -> Path:
+    """
+    Return a mono WAV for input_video at <name>.analysis.wav, reusing a cached one keyed
+    by the video's content hash and sample rate. ffmpeg only runs on a miss; the cache is
+    trimmed LRU by atime. The returned file is the job's own hard link (or copy) of the
+    cache entry, so another job's eviction can't delete it while it is being read.
+    Pass digest (disk_cache.file_digest of input_video) if the caller already has it.
+    """
+    audio_path = input_video.with_suffix(".analysis.wav")
+    if not MAX_WAV_CACHE_BYTES:
+        extract_audio(input_video, audio_path, sample_rate=sample_rate)
+        return audio_path
+
+    if digest is None:
+        digest = disk_cache.file_digest(input_video)
+    cached = WAV_CACHE_DIR / f"{digest}.{sample_rate // 1000}k.wav"
+    try:
+        disk_cache.link_or_copy(cached, audio_path)
+        os.utime(cached)  # mark as recently used for LRU eviction
+        return audio_path
+    except FileNotFoundError:
+        pass  # not cached yet (or just evicted)
+
+    WAV_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = cached.with_name(f"{cached.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        extract_audio(input_video, tmp, sample_rate=sample_rate)
+        # Take the job's link before publishing, so the entry can't be evicted first.
+        disk_cache.link_or_copy(tmp, audio_path)
+        os.replace(tmp, cached)
+    finally:
+        tmp.unlink(missing_ok=True)
+    disk_cache.evict_lru(WAV_CACHE_DIR, MAX_WAV_CACHE_BYTES, keep=cached)
+    return audio_path
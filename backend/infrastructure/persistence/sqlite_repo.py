@@ -0,0 +1,137 @@
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from backend.domain.models import Clip, Job, JobStatus
+
+JOBS_DB_PATH = Path("jobs") / "jobs.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    clips_json TEXT,
+    error TEXT,
+    updated REAL NOT NULL
+)
+"""
+
+_UPSERT = (
+    "INSERT OR REPLACE INTO jobs (id, status, clips_json, error, updated) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+
+_Row = Tuple[str, str, Optional[str], Optional[str], float]
+
+logger = logging.getLogger(__name__)
+
+
+class SqliteJobRepository:
+    """
+    Job repository persisted to SQLite (WAL mode), so jobs survive a server restart.
+
+    The _jobs dict is a write-through L1 cache: save() updates it at once and queues the
+    row for a single writer thread, so callers on the event loop never wait on a commit
+    or fsync. get() is a dict lookup and only reads SQLite (on its own connection, which
+    WAL never blocks behind the writer) for jobs not seen since startup.
+    Jobs still PROCESSING when the previous server stopped are marked FAILED by
+    recover_interrupted_jobs(), which the app calls at startup (not on import).
+    """
+
+    def __init__(self, db_path: Path = JOBS_DB_PATH) -> None:
+        self._jobs: Dict[str, Job] = {}
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Writer connection: used by the writer thread (and recovery, before it has work).
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(_SCHEMA)
+        self._read_conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._read_lock = threading.Lock()
+
+        self._writes: "queue.SimpleQueue[Optional[_Row]]" = queue.SimpleQueue()
+        self._writer = threading.Thread(
+            target=self._write_loop, name="job-db-writer", daemon=True
+        )
+        self._writer.start()
+
+    def recover_interrupted_jobs(self) -> int:
+        """
+        Mark jobs still PROCESSING in the database as FAILED and return how many.
+        Call once at server startup, before any job is submitted: their workers died
+        with the previous server, so they would otherwise poll as processing forever.
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated = ? WHERE status = ?",
+                (
+                    JobStatus.FAILED.value,
+                    "Interrupted by a server restart",
+                    time.time(),
+                    JobStatus.PROCESSING.value,
+                ),
+            )
+        return cursor.rowcount
+
+    def save(self, job: Job) -> None:
+        self._jobs[job.id] = job
+        # Snapshot the row now; the job object may change again before the writer runs.
+        clips_payload = job.clips_payload if job.status == JobStatus.COMPLETED else None
+        clips_json = json.dumps(clips_payload) if clips_payload is not None else None
+        self._writes.put((job.id, job.status.value, clips_json, job.error_message, time.time()))
+
+    def get(self, job_id: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        with self._read_lock:
+            row = self._read_conn.execute(
+                "SELECT status, clips_json, error FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        status, clips_json, error = row
+        job = Job(id=job_id, status=JobStatus(status), error_message=error)
+        if clips_json is not None:
+            job.clips_payload = json.loads(clips_json)
+            job.clips = [Clip(**c) for c in job.clips_payload]
+        return self._jobs.setdefault(job_id, job)
+
+    def close(self) -> None:
+        """Write out every queued save, then stop the writer thread. Call at shutdown."""
+        self._writes.put(None)
+        self._writer.join()
+
+    def _write_loop(self) -> None:
+        """Commit queued rows in order, batching whatever has piled up into one transaction."""
+        while True:
+            rows: List[_Row] = []
+            row = self._writes.get()
+            stopping = row is None
+            while row is not None:
+                rows.append(row)
+                try:
+                    row = self._writes.get_nowait()
+                except queue.Empty:
+                    break
+                stopping = row is None
+            if rows:
+                try:
+                    with self._lock, self._conn:
+                        self._conn.executemany(_UPSERT, rows)
+                except sqlite3.Error:
+                    # The dict still holds these jobs; keep the writer alive for later saves.
+                    logger.exception("Failed to persist %d job update(s)", len(rows))
+            if stopping:
+                return
+
+
+# Single process-wide instance for this app
+job_repository = SqliteJobRepository()
@@ -0,0 +1,68 @@
+"""
+Disk cache of Whisper transcripts keyed by the content digest of the audio
+(disk_cache.file_digest, the same digest the result cache uses).
+
+Retries and re-submitted media (same upload, same YouTube URL) turn a Whisper run into
+a JSON load. Entries live under jobs/.tcache and are trimmed least-recently-used once
+the directory grows past CLIPSCOUT_TCACHE_MB (default 256; 0 disables the cache).
+"""
+import json
+import os
+import re
+import uuid
+from dataclasses import asdict
+from pathlib import Path
+from typing import List, Optional
+
+from backend.infrastructure import disk_cache
+from backend.infrastructure.whisper_adapter import TranscriptSegment
+
+TCACHE_DIR = Path("jobs") / ".tcache"
+TCACHE_MB = int(os.environ.get("CLIPSCOUT_TCACHE_MB", "256"))
+MAX_TCACHE_BYTES = TCACHE_MB * 1024 * 1024
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def _entry_path(digest: str, variant: str) -> Path:
+    # variant (whisper_adapter.transcript_variant) names the model and the settings that
+    # change its output; the model name may also be a local path.
+    return TCACHE_DIR / f"{digest}-{_UNSAFE_CHARS.sub('_', variant)}.json"
+
+
+def get(digest: str, *, variant: str) -> Optional[List[TranscriptSegment]]:
+    """Return the cached transcript for this audio digest and variant, or None on a miss."""
+    if not MAX_TCACHE_BYTES:
+        return None
+    path = _entry_path(digest, variant)
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        segments = [TranscriptSegment(**item) for item in data]
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, TypeError):  # corrupt / stale entry, drop it
+        path.unlink(missing_ok=True)
+        return None
+    try:
+        os.utime(path)  # mark as recently used for LRU eviction
+    except OSError:
+        pass
+    return segments
+
+
+def put(digest: str, segments: List[TranscriptSegment], *, variant: str) -> None:
+    """
+    Store a transcript (atomic rename), then trim the cache to its size cap.
+    Best effort: a full or read-only disk never fails the caller.
+    """
+    if not MAX_TCACHE_BYTES:
+        return
+    path = _entry_path(digest, variant)
+    tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        TCACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps([asdict(s) for s in segments]), encoding="utf-8")
+        os.replace(tmp, path)
+        disk_cache.evict_lru(TCACHE_DIR, MAX_TCACHE_BYTES, keep=path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
@@ -3,9 +3,39 @@ Whisper ASR adapter: transcribe audio to segments with timestamps,
 and extract top keywords from the transcript for clip scoring.
 """
 from dataclasses import dataclass
+from functools import lru_cache
+import os
 from pathlib import Path
 import re
-from typing import List
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+from backend.infrastructure.disk_cache import file_digest
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Whisper always works on 16 kHz mono float32 PCM.
+WHISPER_SAMPLE_RATE = 16000
+
+# Loaded Whisper models, keyed by model size. Loading reads hundreds of MB of weights,
+# so each (worker) process loads a given size once and reuses it for every job.
+_MODEL_CACHE: Dict[str, Any] = {}
+_PIPELINE_CACHE: Dict[str, Any] = {}
+_MODEL_LOCK = threading.Lock()
+
+# VAD chunks of a file are pushed through the encoder this many at a time
+# (faster-whisper BatchedInferencePipeline). Set CLIPSCOUT_WHISPER_BATCH in env to
+# override (default 8; 1 transcribes chunk by chunk, using less memory).
+WHISPER_BATCH_SIZE = int(os.environ.get("CLIPSCOUT_WHISPER_BATCH", "8"))
+
+# Keyword tokens: lowercase alphanumeric runs of length >= 2.
+_TOKEN_RE = re.compile(r"[a-z0-9]{2,}")
+# For ASCII text, the same split via one C-level translate + split: every byte that
+# is not [a-z0-9] becomes a space (text is lowercased first).
+_NON_TOKEN_TO_SPACE = str.maketrans(
+    {c: " " for c in map(chr, range(128)) if not ("a" <= c <= "z" or "0" <= c <= "9")}
+)
 
 # Simple English stopwords for keyword extraction (subset to avoid heavy deps)
 _STOPWORDS = frozenset(
@@ -30,30 +60,145 @@ class TranscriptSegment:
     text: str
 
 
-def transcribe(audio_path: Path, *, model_size: str = "tiny") -> List[TranscriptSegment]:
+@lru_cache(maxsize=None)
+def _resolve_device() -> str:
     """
-    Run Whisper on an audio file and return segments with timestamps.
-    Uses the given model size (tiny, base, small, medium, large). Default tiny for lower memory use.
+    Return "cuda" or "cpu" for Whisper inference. Set CLIPSCOUT_DEVICE in env ("cuda", "cpu")
+    to pin the device (e.g. CPU for tests); default "auto" uses CUDA when a GPU is visible.
+    """
+    device = (os.environ.get("CLIPSCOUT_DEVICE") or "auto").lower()
+    if device != "auto":
+        return device
+    try:
+        import ctranslate2
+
+        return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    except Exception:  # noqa: BLE001 - no CUDA runtime / driver
+        return "cpu"
+
+
+def _compute_type(device: str) -> str:
+    """int8 weights everywhere; on CUDA, FP16 activations as well."""
+    return "int8_float16" if device == "cuda" else "int8"
+
+
+def transcript_variant(model_size: str) -> str:
+    """
+    Identify everything that shapes a transcript besides the audio: the model, its compute
+    type (device precision) and batched vs sequential segmentation. Cache keys for
+    transcripts (and anything derived from them) must include it.
+    """
+    mode = f"batch{WHISPER_BATCH_SIZE}" if WHISPER_BATCH_SIZE > 1 else "seq"
+    return f"{model_size}-{_compute_type(_resolve_device())}-{mode}"
+
+
+def _get_model(model_size: str) -> Any:
+    """
+    Return the cached faster-whisper (CTranslate2) model for model_size, loading it on first use.
+    On CUDA, weights are int8 with FP16 activations (int8_float16); on CPU, plain int8.
     """
-    import whisper
+    model = _MODEL_CACHE.get(model_size)
+    if model is None:
+        with _MODEL_LOCK:
+            model = _MODEL_CACHE.get(model_size)
+            if model is None:
+                from faster_whisper import WhisperModel
 
-    model = whisper.load_model(model_size)
-    result = model.transcribe(str(audio_path), language=None, fp16=False)
+                device = _resolve_device()
+                model = WhisperModel(
+                    model_size, device=device, compute_type=_compute_type(device)
+                )
+                _MODEL_CACHE[model_size] = model
+    return model
+
+
+def _get_pipeline(model_size: str) -> Any:
+    """Return the cached BatchedInferencePipeline wrapping the model for model_size."""
+    pipeline = _PIPELINE_CACHE.get(model_size)
+    if pipeline is None:
+        model = _get_model(model_size)
+        with _MODEL_LOCK:
+            pipeline = _PIPELINE_CACHE.get(model_size)
+            if pipeline is None:
+                from faster_whisper import BatchedInferencePipeline
+
+                pipeline = BatchedInferencePipeline(model=model)
+                _PIPELINE_CACHE[model_size] = pipeline
+    return pipeline
+
+
+def load_audio(audio_path: Path) -> "np.ndarray":
+    """
+    Decode an audio/video file to float32 mono PCM at WHISPER_SAMPLE_RATE.
+    Pass the result to transcribe(audio=...) and to the clip ranker to decode only once.
+    """
+    from faster_whisper import decode_audio
+
+    return decode_audio(str(audio_path), sampling_rate=WHISPER_SAMPLE_RATE)
+
+
+def _run_whisper(source: Union[str, "np.ndarray"], model_size: str) -> List[TranscriptSegment]:
+    """Transcribe a path or PCM array with the cached model, batching VAD chunks if enabled."""
+    if WHISPER_BATCH_SIZE > 1:
+        # without_timestamps=False keeps Whisper's few-second segments; the pipeline's
+        # default emits one segment per ~30 s VAD chunk, too coarse for clip windows.
+        results, _info = _get_pipeline(model_size).transcribe(
+            source,
+            language=None,
+            vad_filter=True,
+            batch_size=WHISPER_BATCH_SIZE,
+            without_timestamps=False,
+        )
+    else:
+        results, _info = _get_model(model_size).transcribe(source, language=None, vad_filter=True)
     segments: List[TranscriptSegment] = []
-    for seg in result.get("segments", []):
-        start = float(seg.get("start", 0))
-        end = float(seg.get("end", start))
-        text = (seg.get("text") or "").strip()
+    for seg in results:  # lazy generator: decoding happens while iterating
+        text = (seg.text or "").strip()
         if text:
-            segments.append(TranscriptSegment(start=start, end=end, text=text))
+            segments.append(
+                TranscriptSegment(start=float(seg.start), end=float(seg.end), text=text)
+            )
+    return segments
+
+
+def transcribe(
+    audio_path: Path,
+    *,
+    model_size: str = "tiny",
+    audio: Optional["np.ndarray"] = None,
+    digest: Optional[str] = None,
+) -> List[TranscriptSegment]:
+    """
+    Run Whisper (faster-whisper) on an audio file and return segments with timestamps.
+    Uses the given model size (tiny, base, small, medium, large). Default tiny for lower memory use.
+    If audio (from load_audio) is given, it is used instead of decoding audio_path again.
+    Silence is skipped by the built-in VAD filter, so it is never decoded; the remaining
+    speech chunks go through the encoder WHISPER_BATCH_SIZE at a time.
+    Transcripts are cached by the content digest of the audio file, so repeated audio skips
+    Whisper; pass digest if the caller already hashed the file, to avoid hashing it again.
+    """
+    from backend.infrastructure import transcript_cache
+
+    if digest is None:
+        digest = file_digest(audio_path)
+    variant = transcript_variant(model_size)
+    cached = transcript_cache.get(digest, variant=variant)
+    if cached is not None:
+        return cached
+
+    source = audio if audio is not None else str(audio_path)
+    segments = _run_whisper(source, model_size)
+    transcript_cache.put(digest, segments, variant=variant)
     return segments
 
 
 def _tokenize(text: str) -> List[str]:
     """Lowercase and split on non-alphanumeric, keep words of length >= 2."""
-    text = text.lower()
-    words = re.findall(r"[a-z0-9]{2,}", text)
-    return words
+    if not text.islower():  # already-lowercase text skips the copy
+        text = text.lower()
+    if not text.isascii():
+        return _TOKEN_RE.findall(text)
+    return [w for w in text.translate(_NON_TOKEN_TO_SPACE).split() if len(w) >= 2]
 
 
 def extract_keywords(
@@ -68,14 +213,17 @@ def extract_keywords(
     from collections import Counter
 
     counter: Counter[str] = Counter()
-    for seg in segments:
-        for word in _tokenize(seg.text):
-            if word not in _STOPWORDS:
-                counter[word] += 1
+    counter.update(
+        word
+        for seg in segments
+        for word in _tokenize(seg.text)
+        if word not in _STOPWORDS
+    )
 
     # Return top_k by count; require min_freq
-    ordered = [w for w, c in counter.most_common(top_k * 2) if c >= min_freq]
-    return ordered[:top_k]
+    if min_freq <= 1:
+        return [w for w, _ in counter.most_common(top_k)]
+    return [w for w, c in counter.most_common() if c >= min_freq][:top_k]
 
 
 def get_text_in_time_range(
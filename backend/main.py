@@ -1,28 +1,58 @@
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from backend.app.api import routes_jobs
+from backend.domain.services.job_service import (
+    close_job_store,
+    recover_interrupted_jobs,
+    shutdown_worker_pool,
+    start_worker_pool,
+)
 
 logger = logging.getLogger("uvicorn.access")
 
-app = FastAPI(title="ClipScout API", version="0.1.0")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Jobs persisted as processing by a previous run can never finish; fail them first.
+    recover_interrupted_jobs()
+    # Long-running jobs run in a process pool so they never stall request handling.
+    app.state.job_pool = start_worker_pool()
+    try:
+        yield
+    finally:
+        shutdown_worker_pool()
+        close_job_store()
+
+
+app = FastAPI(
+    title="ClipScout API",
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
+
+
+class LogRequestsMiddleware:
+    """
+    Log when a request is received (before body is read), so long uploads show up immediately.
+    Plain ASGI middleware: unlike BaseHTTPMiddleware it adds no extra task or stream per request.
+    """
 
-class LogRequestsMiddleware(BaseHTTPMiddleware):
-    """Log when a request is received (before body is read), so long uploads show up immediately."""
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-    async def dispatch(self, request, call_next):
-        method = request.method
-        path = request.url.path
-        logger.info("Request started: %s %s", method, path)
-        response = await call_next(request)
-        return response
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            logger.info("Request started: %s %s", scope["method"], scope["path"])
+        await self.app(scope, receive, send)
 
 
 app.add_middleware(LogRequestsMiddleware)
@@ -48,15 +78,6 @@ if Path("static").is_dir():
     if (static_path / "assets").is_dir():
         app.mount("/assets", StaticFiles(directory="static/assets"), name="assets")
 
-    @app.get("/")
-    async def index():
-        return FileResponse("static/index.html")
-
-    @app.get("/{full_path:path}", include_in_schema=False)
-    async def serve_spa(full_path: str):
-        if full_path.startswith("api/") or full_path.startswith("assets/"):
-            raise HTTPException(status_code=404, detail="Not found")
-        path = static_path / full_path
-        if path.is_file():
-            return FileResponse(path)
-        return FileResponse("static/index.html")
+    # html=True serves index.html for "/" (and directories); files go out via sendfile.
+    # Mounted last so the API routes above take precedence.
+    app.mount("/", StaticFiles(directory="static", html=True), name="spa")